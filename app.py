@@ -1,10 +1,11 @@
 import base64
 import streamlit as st
-from streamlit_gsheets import GSheetsConnection
-import pandas as pd
+import requests
 from datetime import datetime
 
 from modules.analises import show_analises
+from modules.dados import URL_PLANILHA, WORKSHEET
+from modules.sheets import GoogleSheetsBackend, LeitorPlanilha, ErroTransitorio
 from modules.dashboard import show_dashboard
 from modules.ranking import show_ranking
 
@@ -66,31 +67,20 @@ set_png_as_page_bg('bg.jpg')
 # Função para carregar os dados com cache
 @st.cache_data(ttl=600)  # Cache por 10 minutos (600 segundos)
 def load_data():
-    # Conexão com Google Sheets
-    url = "https://docs.google.com/spreadsheets/d/16Dds7dImtxM9OwIYBijZtU0gBIfMmQZljXnrMeGLQww/edit?usp=sharing"
-    conn = st.connection("gsheets", type=GSheetsConnection)
-    df = conn.read(spreadsheet=url, usecols=list(range(14)), worksheet="1635155053")
-    
-    # Ajuste nos nomes de colunas
-    df.columns = [col.strip().replace(" ", "_").replace("(", "").replace(")", "") for col in df.columns]
-    
-    # Conversões de tipos
-    df["Número_de_Pessoas_impactadas"] = pd.to_numeric(df["Número_de_Pessoas_impactadas"], errors="coerce")
-    
-    # Tratamento especial para valores monetários (formato brasileiro)
-    df["Impacto_Econômico_Estimado_R$"] = df["Impacto_Econômico_Estimado_R$"].apply(
-        lambda x: pd.to_numeric(str(x).replace('.', '').replace(',', '.'), errors="coerce")
-    )
-    
-    df["Número_de_Empresas_Apoiadoras"] = pd.to_numeric(df["Número_de_Empresas_Apoiadoras"], errors="coerce")
-    df["Alcance_em_Redes_Sociais_Pessoas"] = pd.to_numeric(df["Alcance_em_Redes_Sociais_Pessoas"], errors="coerce")
-    df["Quantidade_de_Posts_sobre_a_ação"] = pd.to_numeric(df["Quantidade_de_Posts_sobre_a_ação"], errors="coerce")
-    df["Quantidade_de_Likes_nos_Posts"] = pd.to_numeric(df["Quantidade_de_Likes_nos_Posts"], errors="coerce")
-    
-    return df
+    # Leitura do Google Sheets em blocos concorrentes, com timeout e retentativas.
+    # Cada bloco já sai com nomes de colunas ajustados e tipos convertidos.
+    leitor = LeitorPlanilha(GoogleSheetsBackend(URL_PLANILHA))
+    try:
+        return leitor.ler_worksheet(WORKSHEET)
+    finally:
+        leitor.fechar()
 
 # Carrega os dados
-df = load_data()
+try:
+    df = load_data()
+except (ErroTransitorio, requests.RequestException, ValueError):
+    st.error("Não foi possível carregar os dados da planilha. Tente novamente em instantes.")
+    st.stop()
 print(df.info())
 
 ### ------------- SIDEBAR ------------- ###
@@ -0,0 +1,94 @@
+"""Exportação em lote dos relatórios por movimento e por estado.
+
+Uso:
+    python exportar_relatorios.py --formatos html png pdf --processos 4
+
+PNG e PDF dependem do pacote opcional ``kaleido``.
+
+Os relatórios HTML carregam o ``plotly.min.js`` gravado na raiz da pasta de
+saída, então abrem sem internet. Para enviar um relatório, envie a pasta de
+saída inteira (ou ao menos o relatório junto com ``plotly.min.js``, mantendo
+a mesma estrutura de pastas).
+"""
+import argparse
+import time
+
+from modules.dados import URL_PLANILHA, WORKSHEET, carregar_csv
+from modules.relatorios import (
+    AGRUPADORES,
+    FORMATOS,
+    exportar_relatorios,
+    formatos_exigem_kaleido,
+    kaleido_disponivel,
+)
+from modules.sheets import FakeSheetsBackend, GoogleSheetsBackend, LeitorPlanilha
+
+
+def carregar_dados(args):
+    if args.dados:
+        return carregar_csv(args.dados)
+
+    if args.planilha_local:
+        backend = FakeSheetsBackend(args.planilha_local)
+    else:
+        backend = GoogleSheetsBackend(URL_PLANILHA)
+
+    leitor = LeitorPlanilha(backend)
+    try:
+        return leitor.ler_worksheet(WORKSHEET)
+    finally:
+        leitor.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os relatórios estáticos de cada movimento e estado.")
+    parser.add_argument("--dados", default=None, help="CSV local com os dados (padrão: planilha do Google Sheets)")
+    parser.add_argument("--planilha-local", default=None,
+                        help="Pasta com <worksheet>.csv lida pelo backend local, em vez do Google Sheets")
+    parser.add_argument("--saida", default="relatorios", help="Pasta de saída dos relatórios")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["html"])
+    parser.add_argument("--tipos", nargs="+", choices=list(AGRUPADORES), default=list(AGRUPADORES))
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: nº de CPUs)")
+    parser.add_argument("--forcar", action="store_true", help="Regera todos os relatórios, mesmo sem alterações")
+    args = parser.parse_args()
+
+    if formatos_exigem_kaleido(args.formatos) and not kaleido_disponivel():
+        parser.error("os formatos png e pdf exigem o pacote 'kaleido' (pip install kaleido)")
+
+    inicio = time.perf_counter()
+
+    # Dados carregados uma única vez e compartilhados por todos os relatórios
+    df = carregar_dados(args)
+    tempo_dados = time.perf_counter() - inicio
+
+    resultados = exportar_relatorios(
+        df,
+        args.saida,
+        formatos=args.formatos,
+        tipos=args.tipos,
+        processos=args.processos,
+        forcar=args.forcar,
+    )
+
+    for r in resultados:
+        print(f"{r['status']:<8} {r['chave']:<50} {r['segundos']:6.2f}s (cpu {r['segundos_cpu']:.2f}s)")
+
+    gerados = [r for r in resultados if r["status"] == "gerado"]
+    pulados = [r for r in resultados if r["status"] == "pulado"]
+    erros = [r for r in resultados if r["status"].startswith("erro")]
+    tempo_total = time.perf_counter() - inicio
+
+    print("-" * 80)
+    print(f"Gerados: {len(gerados)} | Pulados (sem alterações): {len(pulados)} | Erros: {len(erros)}")
+    print(f"Carga dos dados: {tempo_dados:.2f}s")
+    if gerados:
+        custo = sum(r["segundos"] for r in gerados)
+        print(f"Custo por relatório: {custo / len(gerados):.2f}s em média | soma {custo:.2f}s")
+    print(f"Tempo total: {tempo_total:.2f}s")
+
+    if erros:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import pandas as pd
+
+# Planilha pública com as ações registradas pelos movimentos
+URL_PLANILHA = "https://docs.google.com/spreadsheets/d/16Dds7dImtxM9OwIYBijZtU0gBIfMmQZljXnrMeGLQww/edit?usp=sharing"
+WORKSHEET = "1635155053"
+NUM_COLUNAS = 14
+
+
+def tratar_dados(df):
+    # Ajuste nos nomes de colunas
+    df.columns = [col.strip().replace(" ", "_").replace("(", "").replace(")", "") for col in df.columns]
+
+    # Conversões de tipos
+    df["Número_de_Pessoas_impactadas"] = pd.to_numeric(df["Número_de_Pessoas_impactadas"], errors="coerce")
+
+    # Tratamento especial para valores monetários (formato brasileiro)
+    df["Impacto_Econômico_Estimado_R$"] = df["Impacto_Econômico_Estimado_R$"].apply(
+        lambda x: pd.to_numeric(str(x).replace('.', '').replace(',', '.'), errors="coerce")
+    )
+
+    df["Número_de_Empresas_Apoiadoras"] = pd.to_numeric(df["Número_de_Empresas_Apoiadoras"], errors="coerce")
+    df["Alcance_em_Redes_Sociais_Pessoas"] = pd.to_numeric(df["Alcance_em_Redes_Sociais_Pessoas"], errors="coerce")
+    df["Quantidade_de_Posts_sobre_a_ação"] = pd.to_numeric(df["Quantidade_de_Posts_sobre_a_ação"], errors="coerce")
+    df["Quantidade_de_Likes_nos_Posts"] = pd.to_numeric(df["Quantidade_de_Likes_nos_Posts"], errors="coerce")
+
+    return df
+
+
+def carregar_csv(caminho):
+    # Leitura de um CSV local fora do Streamlit (exportação em lote).
+    # Colunas lidas como texto e linhas vazias descartadas, como na leitura em blocos.
+    df = pd.read_csv(caminho, usecols=list(range(NUM_COLUNAS)), dtype=str)
+    df = df.dropna(how="all").reset_index(drop=True)
+    return tratar_dados(df)
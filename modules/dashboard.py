@@ -8,17 +8,11 @@ import requests
 from st_aggrid import AgGrid, GridOptionsBuilder
 from st_aggrid.shared import JsCode
 
+from modules.metricas import calcular_kpis
+
 def show_dashboard(df):
     # KPIs
-    kpis = {
-        "Pessoas Impactadas": int(df["Número_de_Pessoas_impactadas"].sum()),
-        "Impacto Econômico (R$)": float(df['Impacto_Econômico_Estimado_R$'].sum()),
-        "Empresas Apoiadoras": int(df["Número_de_Empresas_Apoiadoras"].sum()),
-        "Ações Realizadas": df.shape[0],
-        "Alcance Redes Sociais": int(df["Alcance_em_Redes_Sociais_Pessoas"].sum()),
-        "Quantidade de Posts": int(df["Quantidade_de_Posts_sobre_a_ação"].sum()),
-        "Quantidade de Curtidas": int(df["Quantidade_de_Likes_nos_Posts"].sum())
-    }
+    kpis = calcular_kpis(df)
 
     col1, col2, col3 = st.columns(3)
     col4, col5, col6, col7 = st.columns(4)
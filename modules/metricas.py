@@ -0,0 +1,81 @@
+import pandas as pd
+
+# Pontuação por tipo de cobertura de imprensa
+PONTUACOES_COBERTURA = {
+    'Nota em Jornal/Portal de Notícias': 15,
+    'Entrevista no Rádio': 20,
+    'Matéria ao Vivo - Regional': 25,
+    'Matéria ao Vivo - Estadual': 30,
+    'Matéria ao Vivo - Nacional': 45,
+    'Matéria Gravada - Regional': 20,
+    'Matéria Gravada - Estadual': 25,
+    'Matéria Gravada - Nacional': 40
+}
+
+# Categorias do ranking: coluna de pontos -> nome exibido
+CATEGORIAS = {
+    "Pontos_Cobertura": "Cobertura de Imprensa",
+    "Pontos_Engajamento": "Engajamento nas Redes Sociais",
+    "Pontos_Conscientizacao": "Conscientização Socioeducacional",
+    "Pontos_Impacto": "Impacto Econômico",
+    "Pontuação_Total": "Ranking Total",
+}
+
+# Métricas usadas no gráfico de radar
+METRICAS_RADAR = ['Pontos_Cobertura', 'Pontos_Engajamento', 'Pontos_Conscientizacao', 'Pontos_Impacto']
+NOMES_METRICAS_RADAR = ['Cobertura', 'Engajamento', 'Conscientização', 'Impacto']
+
+
+def calcular_kpis(df):
+    return {
+        "Pessoas Impactadas": int(df["Número_de_Pessoas_impactadas"].sum()),
+        "Impacto Econômico (R$)": float(df['Impacto_Econômico_Estimado_R$'].sum()),
+        "Empresas Apoiadoras": int(df["Número_de_Empresas_Apoiadoras"].sum()),
+        "Ações Realizadas": df.shape[0],
+        "Alcance Redes Sociais": int(df["Alcance_em_Redes_Sociais_Pessoas"].sum()),
+        "Quantidade de Posts": int(df["Quantidade_de_Posts_sobre_a_ação"].sum()),
+        "Quantidade de Curtidas": int(df["Quantidade_de_Likes_nos_Posts"].sum())
+    }
+
+
+def calcular_pontuacoes(df):
+    dados = df.copy()
+
+    # Cobertura de imprensa: pontuação pelo tipo de cobertura
+    dados["Pontos_Cobertura"] = dados["Tipo_de_Cobertura"].map(PONTUACOES_COBERTURA).fillna(0)
+
+    # Engajamento: 10 pontos por post + 10 pontos de triplo-duplo (likes >= 50)
+    dados['Pontos_Posts'] = dados['Quantidade_de_Posts_sobre_a_ação'] * 10
+    dados['Pontos_TriploDuplo'] = dados['Quantidade_de_Likes_nos_Posts'].apply(lambda x: 10 if x >= 50 else 0)
+    dados['Pontos_Engajamento'] = dados['Pontos_Posts'] + dados['Pontos_TriploDuplo']
+
+    # Conscientização socioeducacional
+    dados["Pontos_Conscientizacao"] = dados["Número_de_Pessoas_impactadas"] * 0.01
+
+    # Impacto econômico
+    dados["Pontos_Impacto"] = (30) + (dados["Impacto_Econômico_Estimado_R$"] * 0.012) + (dados["Número_de_Empresas_Apoiadoras"] * 10)
+
+    # Pontuação total combinando todas as métricas
+    dados["Pontuação_Total"] = (
+        dados["Pontos_Conscientizacao"] +
+        dados["Pontos_Impacto"] +
+        dados["Pontos_Engajamento"] +
+        dados["Pontos_Cobertura"]
+    )
+
+    return dados
+
+
+def calcular_ranking(dados, coluna_pontos, agrupador="Movimento"):
+    # Soma dos pontos por grupo, do maior para o menor
+    ranking = dados.groupby(agrupador)[coluna_pontos].sum().reset_index()
+    return ranking.sort_values(by=coluna_pontos, ascending=False)
+
+
+def calcular_radar(dados, agrupador="Movimento"):
+    # Médias de cada métrica por grupo, normalizadas para escala de 0 a 1
+    df_radar = pd.DataFrame()
+    for metrica, nome in zip(METRICAS_RADAR, NOMES_METRICAS_RADAR):
+        df_radar[nome] = dados.groupby(agrupador)[metrica].mean()
+
+    return df_radar / df_radar.max()
@@ -1,10 +1,11 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
+
+from modules.metricas import calcular_pontuacoes, calcular_ranking, calcular_radar, NOMES_METRICAS_RADAR
 
 def show_ranking(df):
-    dados = df.copy()
+    dados = calcular_pontuacoes(df)
     
     st.title("Ranking")
     st.write("Aqui você pode ver uma prévia do ranking dos movimentos para cada categoria.")
@@ -16,26 +17,8 @@ def show_ranking(df):
     # ------ Ranking por Pontos de Cobertura de Imprensa ------
     with col1:
         st.markdown("## Maior Cobertura de Imprensa")
-        # 1. Criar um dicionário com os tipos e pontuação
-        pontuacoes = {
-            'Nota em Jornal/Portal de Notícias': 15,
-            'Entrevista no Rádio': 20,
-            'Matéria ao Vivo - Regional': 25,
-            'Matéria ao Vivo - Estadual': 30,
-            'Matéria ao Vivo - Nacional': 45,
-            'Matéria Gravada - Regional': 20,
-            'Matéria Gravada - Estadual': 25,
-            'Matéria Gravada - Nacional': 40
-        }
-
-        # 2. Criar nova coluna com a pontuação atribuída
-        dados["Pontos_Cobertura"] = dados["Tipo_de_Cobertura"].map(pontuacoes).fillna(0)
-
-        # 3. Agrupar por Movimento e somar as pontuações
-        ranking_cobertura = dados.groupby("Movimento")["Pontos_Cobertura"].sum().reset_index()
-
-        # 4. Ordenar do maior para o menor
-        ranking_cobertura = ranking_cobertura.sort_values(by="Pontos_Cobertura", ascending=False)
+        # Agrupar por Movimento e ordenar do maior para o menor
+        ranking_cobertura = calcular_ranking(dados, "Pontos_Cobertura")
         
         # Criar gráfico de barras horizontais
         fig = px.bar(
@@ -65,19 +48,8 @@ def show_ranking(df):
     with col2:
         st.markdown("## Maior Engajamento nas Redes Sociais")
 
-        # 1. Criar um dicionário com os tipos e pontuação
-        # 1. Pontuação por post
-        dados['Pontos_Posts'] = dados['Quantidade_de_Posts_sobre_a_ação'] * 10
-
-        # 2. Pontuação triplo-duplo (likes >= 50)
-        dados['Pontos_TriploDuplo'] = dados['Quantidade_de_Likes_nos_Posts'].apply(lambda x: 10 if x >= 50 else 0)
-
-        # 3. Pontuação total
-        dados['Pontos_Engajamento'] = dados['Pontos_Posts'] + dados['Pontos_TriploDuplo']
-
-        # 4. Agrupamento por movimento
-        ranking_engajamento  = dados.groupby('Movimento')['Pontos_Engajamento'].sum().reset_index()
-        ranking_engajamento = ranking_engajamento.sort_values(by='Pontos_Engajamento', ascending=False)
+        # Agrupamento por movimento
+        ranking_engajamento = calcular_ranking(dados, 'Pontos_Engajamento')
 
         # Criar gráfico de barras horizontais
         fig = px.bar(
@@ -110,12 +82,8 @@ def show_ranking(df):
     with col3:
         st.markdown("## Maior Conscientização Socioeducacional")
 
-        # 1. Pontuação por post
-        dados["Pontos_Conscientizacao"] = dados["Número_de_Pessoas_impactadas"] * 0.01
-        
-        # 2. Agrupamento por movimento
-        ranking_conscientizacao = dados.groupby('Movimento')['Pontos_Conscientizacao'].sum().reset_index()
-        ranking_conscientizacao = ranking_conscientizacao.sort_values(by='Pontos_Conscientizacao', ascending=False)
+        # Agrupamento por movimento
+        ranking_conscientizacao = calcular_ranking(dados, 'Pontos_Conscientizacao')
 
         # Criar gráfico de barras horizontais
         fig = px.bar(
@@ -145,12 +113,8 @@ def show_ranking(df):
     with col4:
         st.markdown("## Maior Impacto Econômico")
 
-        # 1. Pontuação por impacto econômico
-        dados["Pontos_Impacto"] = (30) + (dados["Impacto_Econômico_Estimado_R$"] * 0.012) + (dados["Número_de_Empresas_Apoiadoras"] * 10)
-        
-        # 2. Agrupamento por movimento
-        ranking_impacto = dados.groupby('Movimento')['Pontos_Impacto'].sum().reset_index()
-        ranking_impacto = ranking_impacto.sort_values(by='Pontos_Impacto', ascending=False)
+        # Agrupamento por movimento
+        ranking_impacto = calcular_ranking(dados, 'Pontos_Impacto')
 
         # Criar gráfico de barras horizontais
         fig = px.bar(
@@ -183,17 +147,8 @@ def show_ranking(df):
     with col5:
         st.markdown("## Ranking Total")
 
-        # Calcular pontuação total combinando todas as métricas
-        dados["Pontuação_Total"] = (
-            dados["Pontos_Conscientizacao"] + 
-            dados["Pontos_Impacto"] +
-            dados["Pontos_Engajamento"] +
-            dados["Pontos_Cobertura"]
-        )
-        
         # Agrupar por movimento
-        ranking_total = dados.groupby('Movimento')['Pontuação_Total'].sum().reset_index()
-        ranking_total = ranking_total.sort_values(by='Pontuação_Total', ascending=False)
+        ranking_total = calcular_ranking(dados, 'Pontuação_Total')
 
         # Criar gráfico de barras horizontais
         fig = px.bar(
@@ -223,17 +178,8 @@ def show_ranking(df):
     with col6:
         st.markdown("## Comparação de Métricas")
 
-        # Preparar dados para o gráfico de radar
-        metricas = ['Pontos_Cobertura', 'Pontos_Engajamento', 'Pontos_Conscientizacao', 'Pontos_Impacto']
-        nomes_metricas = ['Cobertura', 'Engajamento', 'Conscientização', 'Impacto']
-
-        # Criar um DataFrame com as médias normalizadas de cada métrica
-        df_radar = pd.DataFrame()
-        for metrica, nome in zip(metricas, nomes_metricas):
-            df_radar[nome] = dados.groupby('Movimento')[metrica].mean()
-
-        # Normalizar os valores para escala de 0 a 1
-        df_radar_normalizado = df_radar / df_radar.max()
+        # Médias de cada métrica por movimento, normalizadas de 0 a 1
+        df_radar_normalizado = calcular_radar(dados)
 
         # Criar o gráfico de radar
         fig = go.Figure()
@@ -242,7 +188,7 @@ def show_ranking(df):
         for movimento in df_radar_normalizado.index:
             fig.add_trace(go.Scatterpolar(
                 r=df_radar_normalizado.loc[movimento].values,
-                theta=nomes_metricas,
+                theta=NOMES_METRICAS_RADAR,
                 fill='toself',
                 name=movimento
             ))
@@ -0,0 +1,377 @@
+import hashlib
+import html
+import importlib.util
+import io
+import json
+import os
+import re
+import shutil
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from modules.metricas import (
+    CATEGORIAS,
+    NOMES_METRICAS_RADAR,
+    calcular_kpis,
+    calcular_pontuacoes,
+    calcular_radar,
+    calcular_ranking,
+)
+
+# Versão do layout dos relatórios: alterar força a regeração de todos
+VERSAO_RELATORIO = 2
+
+FORMATOS = ("html", "png", "pdf")
+
+# Tipo de relatório -> coluna usada no agrupamento
+AGRUPADORES = {
+    "movimento": "Movimento",
+    "estado": "Estado",
+}
+
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Cópia local do plotly.js na raiz da saída: os relatórios HTML abrem sem internet
+ARQUIVO_PLOTLYJS = "plotly.min.js"
+
+# Contexto compartilhado com os processos do pool (preenchido por _inicializar_worker)
+_contexto = None
+
+
+def preparar_contexto(df):
+    # Pontuação e rankings calculados uma única vez para todos os relatórios
+    dados = calcular_pontuacoes(df)
+    rankings = {
+        agrupador: {coluna: calcular_ranking(dados, coluna, agrupador) for coluna in CATEGORIAS}
+        for agrupador in AGRUPADORES.values()
+    }
+    radares = {agrupador: calcular_radar(dados, agrupador).fillna(0) for agrupador in AGRUPADORES.values()}
+    return {"dados": dados, "rankings": rankings, "radares": radares}
+
+
+def formatos_exigem_kaleido(formatos):
+    return any(formato in ("png", "pdf") for formato in formatos)
+
+
+def kaleido_disponivel():
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def slugify(texto):
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-zA-Z0-9]+", "-", texto).strip("-").lower() or "sem-nome"
+
+
+def _chaves_estaveis(tipo, valores, manifesto):
+    # Nomes já exportados mantêm a pasta registrada no manifesto. Nomes novos usam o slug;
+    # se ele já pertencer a outro nome ("Jovens SP" e "Jovens-SP"), recebem um sufixo
+    # com o hash do nome original.
+    anteriores = {
+        entrada["nome"]: chave
+        for chave, entrada in manifesto.items()
+        if chave.startswith(f"{tipo}/") and "nome" in entrada
+    }
+
+    chaves = {valor: anteriores[str(valor)] for valor in valores if str(valor) in anteriores}
+    ocupadas = set(chaves.values())
+    for valor in valores:
+        if valor in chaves:
+            continue
+        chave = f"{tipo}/{slugify(valor)}"
+        if chave in ocupadas:
+            chave = f"{chave}-{hashlib.sha1(str(valor).encode()).hexdigest()[:8]}"
+        if chave in ocupadas:
+            raise ValueError(f"Nomes de {tipo} com a mesma pasta de saída: {chave}")
+        chaves[valor] = chave
+        ocupadas.add(chave)
+    return chaves
+
+
+def _remover_obsoletos(saida, tipo, chaves, manifesto):
+    # Remove pastas e entradas do manifesto de grupos que não existem mais nos dados
+    atuais = set(chaves.values())
+    for chave in [c for c in manifesto if c.startswith(f"{tipo}/") and c not in atuais]:
+        del manifesto[chave]
+        if ".." not in chave.split("/"):
+            shutil.rmtree(os.path.join(saida, chave), ignore_errors=True)
+
+
+def _formatar_inteiro(valor):
+    return f"{int(valor):,}".replace(",", ".")
+
+
+def _formatar_decimal(valor):
+    # Formato brasileiro: 1.234,56
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _formatar_moeda(valor):
+    return f"R$ {_formatar_decimal(valor)}"
+
+
+def _posicoes(contexto, agrupador, valor):
+    # Posição do grupo em cada categoria do ranking
+    posicoes = []
+    for coluna, nome in CATEGORIAS.items():
+        ranking = contexto["rankings"][agrupador][coluna].reset_index(drop=True)
+        linha = ranking.index[ranking[agrupador] == valor]
+        if len(linha) == 0:
+            continue
+        posicoes.append({
+            "Categoria": nome,
+            "Posição": int(linha[0]) + 1,
+            "Total": len(ranking),
+            "Pontuação": round(float(ranking.loc[linha[0], coluna]), 2),
+        })
+    return posicoes
+
+
+def _assinatura(contexto, agrupador, valor, formatos):
+    # Hash de tudo que influencia o relatório: linhas do grupo, posições, radar e formatos
+    dados_grupo = contexto["dados"][contexto["dados"][agrupador] == valor]
+    entrada = {
+        "versao": VERSAO_RELATORIO,
+        "formatos": sorted(formatos),
+        "dados": dados_grupo.to_csv(index=False),
+        "posicoes": _posicoes(contexto, agrupador, valor),
+        "radar": contexto["radares"][agrupador].loc[valor].round(6).tolist(),
+    }
+    return hashlib.sha256(json.dumps(entrada, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _montar_figuras(contexto, agrupador, valor):
+    dados_grupo = contexto["dados"][contexto["dados"][agrupador] == valor]
+    figuras = []
+
+    # ========== KPIs ==========
+    kpis = calcular_kpis(dados_grupo)
+    valores_kpis = [
+        _formatar_moeda(v) if k == "Impacto Econômico (R$)" else _formatar_inteiro(v)
+        for k, v in kpis.items()
+    ]
+    fig_kpis = go.Figure(go.Table(
+        header=dict(values=["Indicador", "Valor"]),
+        cells=dict(values=[list(kpis.keys()), valores_kpis])
+    ))
+    fig_kpis.update_layout(title="Indicadores", height=320, margin=dict(l=10, r=10, t=40, b=10))
+    figuras.append(("kpis", fig_kpis))
+
+    # ========== Posição no ranking ==========
+    posicoes = _posicoes(contexto, agrupador, valor)
+    fig_ranking = go.Figure(go.Table(
+        header=dict(values=["Categoria", "Posição", "Pontuação"]),
+        cells=dict(values=[
+            [p["Categoria"] for p in posicoes],
+            [f"{p['Posição']}º de {p['Total']}" for p in posicoes],
+            [_formatar_decimal(p["Pontuação"]) for p in posicoes],
+        ])
+    ))
+    fig_ranking.update_layout(title="Posição no Ranking", height=260, margin=dict(l=10, r=10, t=40, b=10))
+    figuras.append(("ranking", fig_ranking))
+
+    # ========== Radar ==========
+    radar = contexto["radares"][agrupador].loc[valor]
+    fig_radar = go.Figure(go.Scatterpolar(
+        r=radar.values,
+        theta=NOMES_METRICAS_RADAR,
+        fill='toself',
+        name=str(valor)
+    ))
+    fig_radar.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+        showlegend=False,
+        title="Comparação de Desempenho por Métrica",
+        height=500
+    )
+    figuras.append(("radar", fig_radar))
+
+    # ========== Pessoas vs Tipo de Ação ==========
+    df_acao = dados_grupo.groupby("Tipo_de_Ação").agg({
+        "Número_de_Pessoas_impactadas": "sum",
+        "Data_da_Ação": "count"
+    }).rename(columns={"Data_da_Ação": "Qtd_Ações"}).reset_index()
+
+    fig_acao = px.bar(
+        df_acao.sort_values(by="Número_de_Pessoas_impactadas", ascending=False),
+        x="Tipo_de_Ação",
+        y="Número_de_Pessoas_impactadas",
+        text_auto=True,
+        hover_data=["Qtd_Ações"],
+        title="Pessoas VS Ação",
+        labels={"Número_de_Pessoas_impactadas": "Pessoas", "Tipo_de_Ação": "Ação", "Qtd_Ações": "Ações"}
+    )
+    fig_acao.update_layout(xaxis_tickangle=-20, margin=dict(t=40, b=80), height=400)
+    figuras.append(("acoes", fig_acao))
+
+    return figuras
+
+
+def _salvar_plotlyjs(saida):
+    # Regravado a cada execução para acompanhar a versão instalada do plotly
+    with open(os.path.join(saida, ARQUIVO_PLOTLYJS), "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+
+
+def _salvar_html(figuras, titulo, caminho, caminho_plotlyjs):
+    partes = [fig.to_html(full_html=False, include_plotlyjs=False) for _, fig in figuras]
+
+    titulo = html.escape(titulo)
+    pagina = f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<script src="{html.escape(caminho_plotlyjs)}"></script>
+</head>
+<body>
+<h1>CONAJE - Feirão do Imposto 2024</h1>
+<h2>{titulo}</h2>
+{"".join(partes)}
+</body>
+</html>
+"""
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(pagina)
+
+
+def _salvar_pdf(imagens_png, caminho):
+    # Junta as imagens PNG em um único PDF, uma figura por página
+    from PIL import Image
+
+    paginas = [Image.open(io.BytesIO(png)).convert("RGB") for png in imagens_png]
+    paginas[0].save(caminho, save_all=True, append_images=paginas[1:])
+
+
+def _caminho_plotlyjs(chave):
+    # Caminho relativo da pasta do relatório até o plotly.js na raiz da saída
+    return "../" * len(chave.split("/")) + ARQUIVO_PLOTLYJS
+
+
+def _inicializar_worker(contexto):
+    global _contexto
+    _contexto = contexto
+
+
+def _gerar_relatorio(tipo, valor, pasta, formatos, caminho_plotlyjs):
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+
+    agrupador = AGRUPADORES[tipo]
+    figuras = _montar_figuras(_contexto, agrupador, valor)
+    titulo = f"{agrupador}: {valor}"
+    os.makedirs(pasta, exist_ok=True)
+    arquivos = []
+
+    if "html" in formatos:
+        caminho = os.path.join(pasta, "relatorio.html")
+        _salvar_html(figuras, titulo, caminho, caminho_plotlyjs)
+        arquivos.append(caminho)
+
+    if formatos_exigem_kaleido(formatos):
+        imagens = [pio.to_image(fig, format="png", width=1000, scale=2) for _, fig in figuras]
+
+        if "png" in formatos:
+            for (nome, _), png in zip(figuras, imagens):
+                caminho = os.path.join(pasta, f"{nome}.png")
+                with open(caminho, "wb") as f:
+                    f.write(png)
+                arquivos.append(caminho)
+
+        if "pdf" in formatos:
+            caminho = os.path.join(pasta, "relatorio.pdf")
+            _salvar_pdf(imagens, caminho)
+            arquivos.append(caminho)
+
+    return {
+        "arquivos": arquivos,
+        "segundos": time.perf_counter() - inicio,
+        "segundos_cpu": time.process_time() - inicio_cpu,
+    }
+
+
+def _carregar_manifesto(saida):
+    caminho = os.path.join(saida, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _salvar_manifesto(saida, manifesto):
+    # Grava em arquivo temporário e substitui, para não deixar o manifesto pela metade
+    caminho = os.path.join(saida, ARQUIVO_MANIFESTO)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(caminho + ".tmp", caminho)
+
+
+def exportar_relatorios(df, saida, formatos=("html",), tipos=tuple(AGRUPADORES), processos=None, forcar=False):
+    # Gera os relatórios de cada movimento e estado em paralelo. Relatórios cujas
+    # entradas não mudaram desde a última execução (mesma assinatura no manifesto
+    # e arquivos presentes) são pulados.
+    contexto = preparar_contexto(df)
+    os.makedirs(saida, exist_ok=True)
+    manifesto = _carregar_manifesto(saida)
+
+    if "html" in formatos:
+        _salvar_plotlyjs(saida)
+
+    resultados = []
+    tarefas = []
+    for tipo in tipos:
+        agrupador = AGRUPADORES[tipo]
+        valores = sorted(contexto["dados"][agrupador].dropna().unique())
+        chaves = _chaves_estaveis(tipo, valores, manifesto)
+        _remover_obsoletos(saida, tipo, chaves, manifesto)
+        for valor in valores:
+            chave = chaves[valor]
+            assinatura = _assinatura(contexto, agrupador, valor, formatos)
+            anterior = manifesto.get(chave)
+            # Caminhos do manifesto são relativos a `saida`
+            if (not forcar and anterior and anterior["assinatura"] == assinatura
+                    and all(os.path.exists(os.path.join(saida, a)) for a in anterior["arquivos"])):
+                resultados.append({"chave": chave, "status": "pulado", "segundos": 0.0, "segundos_cpu": 0.0})
+                continue
+            tarefas.append((chave, assinatura, tipo, valor))
+
+    try:
+        if tarefas:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_worker,
+                                     initargs=(contexto,)) as pool:
+                futuros = {
+                    pool.submit(_gerar_relatorio, tipo, valor, os.path.join(saida, chave), formatos,
+                                _caminho_plotlyjs(chave)): (chave, assinatura, valor)
+                    for chave, assinatura, tipo, valor in tarefas
+                }
+                for futuro in as_completed(futuros):
+                    chave, assinatura, valor = futuros[futuro]
+                    try:
+                        resultado = futuro.result()
+                    except Exception as erro:
+                        # Sem assinatura para ser regerado na próxima execução, mantendo a pasta do nome
+                        manifesto[chave] = {"nome": str(valor), "assinatura": None, "arquivos": []}
+                        resultados.append({"chave": chave, "status": f"erro: {erro}", "segundos": 0.0, "segundos_cpu": 0.0})
+                    else:
+                        manifesto[chave] = {
+                            "nome": str(valor),
+                            "assinatura": assinatura,
+                            "arquivos": [os.path.relpath(a, saida).replace(os.sep, "/") for a in resultado["arquivos"]],
+                        }
+                        resultados.append({
+                            "chave": chave,
+                            "status": "gerado",
+                            "segundos": resultado["segundos"],
+                            "segundos_cpu": resultado["segundos_cpu"],
+                        })
+                    # Registra cada relatório concluído: uma execução interrompida não perde o que já foi gerado
+                    _salvar_manifesto(saida, manifesto)
+    finally:
+        _salvar_manifesto(saida, manifesto)
+
+    return sorted(resultados, key=lambda r: r["chave"])
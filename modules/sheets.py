@@ -0,0 +1,298 @@
+import argparse
+import csv
+import io
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.dados import NUM_COLUNAS, URL_PLANILHA, WORKSHEET, carregar_csv, tratar_dados
+
+
+class ErroTransitorio(Exception):
+    # Falha que pode ser resolvida repetindo a requisição (timeout, conexão, 429, 5xx)
+    pass
+
+
+def _letra_coluna(numero):
+    # 1 -> A, 14 -> N, 27 -> AA
+    letras = ""
+    while numero > 0:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _ultima_linha_preenchida(registros):
+    # Número (1-based) do último registro com a primeira célula preenchida
+    for indice in range(len(registros), 0, -1):
+        registro = registros[indice - 1]
+        if registro and registro[0].strip():
+            return indice
+    return 0
+
+
+class GoogleSheetsBackend:
+    # Lê intervalos de linhas pelo link de exportação CSV, reaproveitando as conexões HTTP
+
+    def __init__(self, url=URL_PLANILHA, timeout=(5, 30), conexoes=10):
+        self.base = url.split("/edit")[0]
+        self.timeout = timeout
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+        self.sessao.mount("https://", adaptador)
+
+    def _exportar(self, worksheet, intervalo):
+        try:
+            resposta = self.sessao.get(
+                f"{self.base}/export",
+                params={"format": "csv", "gid": worksheet, "range": intervalo},
+                timeout=self.timeout,
+            )
+        except (requests.Timeout, requests.ConnectionError) as erro:
+            raise ErroTransitorio(f"{worksheet} {intervalo}: {erro}") from erro
+
+        if resposta.status_code == 429 or resposta.status_code >= 500:
+            raise ErroTransitorio(f"{worksheet} {intervalo}: HTTP {resposta.status_code}")
+        resposta.raise_for_status()
+
+        resposta.encoding = "utf-8"
+        return resposta.text
+
+    def ultima_linha(self, worksheet):
+        # Leitura só da coluna A (Data da Ação), preenchida em toda linha usada
+        texto = self._exportar(worksheet, "A:A")
+        return _ultima_linha_preenchida(list(csv.reader(io.StringIO(texto))))
+
+    def ler_intervalo(self, worksheet, linha_inicio, linha_fim, num_colunas):
+        return self._exportar(worksheet, f"A{linha_inicio}:{_letra_coluna(num_colunas)}{linha_fim}")
+
+    def fechar(self):
+        self.sessao.close()
+
+
+class FakeSheetsBackend:
+    # Backend local para testes offline: cada worksheet é o arquivo <pasta>/<worksheet>.csv.
+    # Permite simular latência, falhas transitórias e respostas sem as linhas vazias finais
+    # do intervalo, para medir vazão e retentativas.
+
+    def __init__(self, pasta, latencia=0.0, taxa_falhas=0.0, descartar_vazias_finais=False, semente=None):
+        self.pasta = pasta
+        self.latencia = latencia
+        self.taxa_falhas = taxa_falhas
+        self.descartar_vazias_finais = descartar_vazias_finais
+        self.requisicoes = 0
+        self.falhas = 0
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._planilhas = {}
+
+    def _linhas(self, worksheet):
+        with self._trava:
+            if worksheet not in self._planilhas:
+                caminho = os.path.join(self.pasta, f"{worksheet}.csv")
+                with open(caminho, encoding="utf-8", newline="") as f:
+                    self._planilhas[worksheet] = list(csv.reader(f))
+            return self._planilhas[worksheet]
+
+    def _simular_requisicao(self, descricao):
+        with self._trava:
+            self.requisicoes += 1
+            falhar = self._aleatorio.random() < self.taxa_falhas
+            if falhar:
+                self.falhas += 1
+
+        if self.latencia:
+            time.sleep(self.latencia)
+        if falhar:
+            raise ErroTransitorio(f"{descricao}: falha simulada")
+
+    def ultima_linha(self, worksheet):
+        self._simular_requisicao(f"{worksheet} A:A")
+        return _ultima_linha_preenchida(self._linhas(worksheet))
+
+    def ler_intervalo(self, worksheet, linha_inicio, linha_fim, num_colunas):
+        self._simular_requisicao(f"{worksheet} A{linha_inicio}:{linha_fim}")
+
+        linhas = self._linhas(worksheet)[linha_inicio - 1:linha_fim]
+        if self.descartar_vazias_finais:
+            while linhas and not any(celula.strip() for celula in linhas[-1]):
+                linhas = linhas[:-1]
+
+        saida = io.StringIO()
+        escritor = csv.writer(saida, lineterminator="\n")
+        for linha in linhas:
+            escritor.writerow(linha[:num_colunas])
+        return saida.getvalue()
+
+    def fechar(self):
+        pass
+
+
+class LeitorPlanilha:
+    # Lê worksheets em blocos de linhas concorrentes, com retentativas e backoff com jitter.
+    # Cada bloco passa pelo tratamento de dados assim que chega.
+
+    def __init__(self, backend, tamanho_bloco=500, concorrencia=4, tentativas=4,
+                 espera_base=0.5, espera_maxima=8.0, num_colunas=NUM_COLUNAS):
+        self.backend = backend
+        self.tamanho_bloco = tamanho_bloco
+        self.concorrencia = concorrencia
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.num_colunas = num_colunas
+        self.retentativas = 0
+        self._trava = threading.Lock()
+
+    def _com_retentativas(self, funcao, *args, cancelado=None):
+        # `cancelado` interrompe a espera entre tentativas quando a leitura já falhou
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                return funcao(*args)
+            except ErroTransitorio:
+                if tentativa == self.tentativas:
+                    raise
+                with self._trava:
+                    self.retentativas += 1
+                # Backoff exponencial com jitter completo
+                limite = min(self.espera_maxima, self.espera_base * 2 ** (tentativa - 1))
+                espera = random.uniform(0, limite)
+                if cancelado is None:
+                    time.sleep(espera)
+                elif cancelado.wait(espera):
+                    raise
+
+    def ler_blocos(self, worksheet=WORKSHEET):
+        # Gera os blocos já tratados, na ordem das linhas da planilha. A última linha usada é
+        # descoberta antes e cada bloco pede um intervalo exato, então uma resposta que omite
+        # linhas vazias no fim do intervalo não é confundida com o fim da planilha.
+        ultima = self._com_retentativas(self.backend.ultima_linha, worksheet)
+        if ultima == 0:
+            raise ValueError(f"Worksheet {worksheet} sem cabeçalho")
+
+        # O primeiro bloco começa no cabeçalho (linha 1)
+        intervalos = deque(
+            (inicio, min(inicio + self.tamanho_bloco - 1, ultima))
+            for inicio in range(1, ultima + 1, self.tamanho_bloco)
+        )
+        pendentes = deque()
+        colunas = None
+        cancelado = threading.Event()
+
+        pool = ThreadPoolExecutor(max_workers=self.concorrencia)
+        try:
+            def submeter():
+                if intervalos:
+                    inicio, fim = intervalos.popleft()
+                    pendentes.append(pool.submit(
+                        self._com_retentativas, self.backend.ler_intervalo, worksheet, inicio, fim,
+                        self.num_colunas, cancelado=cancelado
+                    ))
+
+            for _ in range(self.concorrencia):
+                submeter()
+
+            while pendentes:
+                texto = pendentes.popleft().result()
+                submeter()
+
+                # Tudo como texto: a inferência de tipos por bloco mudaria conforme a divisão
+                # (ex.: "1.000" lido como 1.0 em um bloco e como texto em outro)
+                if colunas is None:
+                    bloco = pd.read_csv(io.StringIO(texto), dtype=str, skip_blank_lines=False)
+                    colunas = list(bloco.columns)
+                elif texto:
+                    bloco = pd.read_csv(io.StringIO(texto), header=None, names=colunas, dtype=str,
+                                        skip_blank_lines=False)
+                else:
+                    continue
+
+                yield tratar_dados(bloco.dropna(how="all"))
+        finally:
+            # Se um bloco falhou (ou o consumidor parou de ler), o erro sobe na hora:
+            # os blocos na fila são cancelados e os em andamento abandonam as retentativas
+            cancelado.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def ler_worksheet(self, worksheet=WORKSHEET):
+        blocos = list(self.ler_blocos(worksheet))
+        # Blocos vazios só são usados para manter as colunas quando não há nenhuma linha
+        nao_vazios = [bloco for bloco in blocos if not bloco.empty]
+        return pd.concat(nao_vazios or blocos[:1], ignore_index=True)
+
+    def ler_worksheets(self, worksheets):
+        # Lê várias worksheets (abas de campanha) em paralelo
+        pool = ThreadPoolExecutor(max_workers=len(worksheets) or 1)
+        try:
+            futuros = [pool.submit(self.ler_worksheet, worksheet) for worksheet in worksheets]
+            return {worksheet: futuro.result() for worksheet, futuro in zip(worksheets, futuros)}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def fechar(self):
+        self.backend.fechar()
+
+
+def main():
+    # Medição de vazão e tratamento de falhas contra o backend local
+    parser = argparse.ArgumentParser(description="Mede a leitura em blocos usando o backend local de planilhas.")
+    parser.add_argument("pasta", help="Pasta com os arquivos <worksheet>.csv")
+    parser.add_argument("--worksheets", nargs="+", default=[WORKSHEET])
+    parser.add_argument("--tamanho-bloco", type=int, default=500)
+    parser.add_argument("--concorrencia", type=int, default=4)
+    parser.add_argument("--tentativas", type=int, default=4)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência simulada por requisição (s)")
+    parser.add_argument("--taxa-falhas", type=float, default=0.0, help="Probabilidade de falha por requisição")
+    parser.add_argument("--descartar-vazias-finais", action="store_true",
+                        help="Simula respostas que omitem as linhas vazias no fim de cada intervalo")
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args()
+
+    backend = FakeSheetsBackend(
+        args.pasta,
+        latencia=args.latencia,
+        taxa_falhas=args.taxa_falhas,
+        descartar_vazias_finais=args.descartar_vazias_finais,
+        semente=args.semente,
+    )
+    leitor = LeitorPlanilha(
+        backend,
+        tamanho_bloco=args.tamanho_bloco,
+        concorrencia=args.concorrencia,
+        tentativas=args.tentativas,
+        espera_base=min(0.5, args.latencia or 0.05),
+    )
+
+    inicio = time.perf_counter()
+    try:
+        resultados = leitor.ler_worksheets(args.worksheets)
+    finally:
+        leitor.fechar()
+    tempo = time.perf_counter() - inicio
+
+    # Confere a leitura em blocos com uma leitura única do mesmo arquivo
+    divergentes = []
+    for worksheet, df in resultados.items():
+        referencia = carregar_csv(os.path.join(args.pasta, f"{worksheet}.csv"))
+        confere = df.equals(referencia)
+        if not confere:
+            divergentes.append(worksheet)
+        print(f"{worksheet}: {len(df)} linhas | confere com leitura única: {'sim' if confere else 'NÃO'}")
+
+    total_linhas = sum(len(df) for df in resultados.values())
+    print(f"Tempo: {tempo:.2f}s | {total_linhas / tempo:,.0f} linhas/s")
+    print(f"Requisições: {backend.requisicoes} | Falhas simuladas: {backend.falhas} | Retentativas: {leitor.retentativas}")
+
+    if divergentes:
+        raise SystemExit(f"Leitura em blocos diverge da leitura única: {', '.join(divergentes)}")
+
+
+if __name__ == "__main__":
+    main()